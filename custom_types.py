@@ -0,0 +1,13 @@
+"""
+Custom types shared across modules.
+"""
+
+__all__ = ["DemoError"]
+
+
+class DemoError(Exception):
+    """Raised when a feature is out of scope for the demo (e.g. file size limits)."""
+
+    def __init__(self, feature: str):
+        super().__init__(f"Not supported in demo: {feature}")
+        self.feature = feature
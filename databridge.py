@@ -0,0 +1,288 @@
+"""
+Headless batch CLI for template-driven ETL.
+
+Heavy modules (pandas, getdata, etl) are imported lazily, only when a job
+actually runs, so `--help` and small scheduled jobs start fast.
+"""
+
+__all__ = ["import_breakdown", "run_job", "main"]
+
+from importlib import import_module
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import argparse
+import sys
+import time
+
+
+# modules in import order; each timing is the cost on top of the previous ones
+HEAVY_MODULES = ("pandas", "getdata", "etl")
+
+
+def import_breakdown(
+    modules: Sequence[str] = HEAVY_MODULES
+) -> List[Tuple[str, float]]:
+    """
+    Import modules in order and measure the time spent on each.
+
+    Modules already present in `sys.modules` are reported with 0.0 seconds.
+    Returns a list of (module_name, seconds).
+    """
+    timings: List[Tuple[str, float]] = []
+    for name in modules:
+        if name in sys.modules:
+            timings.append((name, 0.0))
+            continue
+        start = time.perf_counter()
+        import_module(name)
+        timings.append((name, time.perf_counter() - start))
+    return timings
+
+
+def default_template_path(source: Path) -> Path:
+    """Template location used by MetaEditor: Data/templates/<stem>_meta.json"""
+    return source.parent / "templates" / (source.stem + "_meta.json")
+
+
+def write_df(df, output: Optional[Path]) -> None:
+    """Write DataFrame to .json (records) or .csv; None -> CSV to stdout."""
+    if output is None:
+        df.to_csv(sys.stdout, index=False)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix.lower() == ".json":
+        df.to_json(output, orient="records", force_ascii=False, indent=2)
+    else:
+        df.to_csv(output, index=False)
+
+
+def run_job(
+    sources: Sequence[Path],
+    template_path: Path,
+    output: Optional[Path] = None,
+    drop_duplicates: bool = False,
+    quarantine: Optional[Path] = None,
+    max_error_rate: Optional[float] = None,
+    engine: str = "python",
+    rollup: Optional[Path] = None,
+    rollup_spec: Tuple[str, str, Tuple[str, ...]] = ("date", "total_amount",
+                                                     ("category", "location"))
+) -> Tuple[int, int]:
+    """
+    Run template-driven ETL over one or more sources of the same structure.
+
+    Args:
+        sources: Input files; the first one creates the DataFrame, the rest
+            are appended.
+        template_path: MetaEditor template (`*_meta.json`).
+        output: Output file (`.csv` or `.json`). If None, CSV goes to stdout.
+        drop_duplicates: If True, duplicate rows are removed from the result.
+        quarantine: If set, rows with conversion failures are moved out of
+            the result into this file (with `_source`, `_row`, `_reasons`).
+            If None, such rows stay in the result with failed values as None.
+        max_error_rate: Maximal share of rejected rows per source; exceeding
+            it aborts the run with `etl.ValidationError`.
+        engine: "python" or "arrow" (pyarrow-backed columns).
+        rollup: If set, the result is added to this Parquet rollup
+            (`etl.update_rollup`); a rerun with unchanged sources is skipped.
+        rollup_spec: (date column, value column, dimension columns)
+            of the result used for the rollup.
+
+    Returns:
+        (rows, rejected): rows in the result and rows with conversion
+        failures (moved to quarantine, or kept if quarantine is None).
+    """
+    from etl import (load_template, create_df_from_file, append_df_from_file,
+                     validate_df_from_file)
+
+    template = load_template(template_path)
+
+    if quarantine is None and max_error_rate is None:
+        df = create_df_from_file(sources[0], template, engine=engine)
+        for source in sources[1:]:
+            df = append_df_from_file(df, source, template, engine=engine)
+        rejected = None
+    else:
+        import pandas as pd
+
+        frames, bad_frames = [], []
+        for i, source in enumerate(sources):
+            df, bad = validate_df_from_file(source, template,
+                                            max_error_rate=max_error_rate,
+                                            engine=engine,
+                                            keep_rejected=quarantine is None)
+            # same rule as append_df_from_file for appended sources
+            frames.append(df.dropna(how="all") if i else df)
+            bad_frames.append(bad.assign(_source=str(source)))
+        df = pd.concat(frames, ignore_index=True)
+        rejected = pd.concat(bad_frames, ignore_index=True)
+
+    if drop_duplicates:
+        df = df.drop_duplicates(ignore_index=True)
+
+    if rollup is not None:
+        from etl import check_rollup_columns
+        # columns and stored rollup schema, before anything is written
+        check_rollup_columns(df, *rollup_spec, rollup_path=rollup)
+
+    write_df(df, output)
+    if rollup is not None:
+        from etl import update_rollup, batch_id
+        date_col, value_col, dims = rollup_spec
+        update_rollup(rollup, df, date_col, value_col, dims,
+                      batch=batch_id(list(sources)))
+    if quarantine is not None and rejected is not None:
+        write_df(rejected, quarantine)
+
+    return len(df), 0 if rejected is None else len(rejected)
+
+
+def print_timings(timings: List[Tuple[str, float]], title: str) -> None:
+    total = sum(t for _, t in timings)
+    print(f"--- {title} ---", file=sys.stderr)
+    for name, seconds in timings:
+        print(f"{name:<12} {seconds * 1000:9.1f} ms", file=sys.stderr)
+    print(f"{'total':<12} {total * 1000:9.1f} ms", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="databridge",
+        description="Run template-driven ETL non-interactively."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="normalize source files by template")
+    run.add_argument("sources", nargs="+", type=Path,
+                     help="input CSV/JSON files of the same structure")
+    run.add_argument("-t", "--template", type=Path,
+                     help="template path "
+                          "[default: <dir>/templates/<stem>_meta.json "
+                          "of the first source]")
+    run.add_argument("-o", "--output", type=Path,
+                     help="output .csv or .json [default: CSV to stdout]")
+    run.add_argument("--drop-duplicates", action="store_true",
+                     help="remove duplicate rows from the result")
+    run.add_argument("-q", "--quarantine", type=Path,
+                     help="move rows with conversion failures to this "
+                          ".csv/.json file together with their reasons")
+    run.add_argument("--max-error-rate", type=float,
+                     help="abort if the share of rejected rows in a source "
+                          "exceeds this value (0..1)")
+    run.add_argument("--engine", choices=("python", "arrow"), default="python",
+                     help="in-memory representation: Python objects or "
+                          "Arrow columns (requires pyarrow) [default: python]")
+    run.add_argument("--rollup", type=Path,
+                     help="add the result to this Parquet rollup "
+                          "(sum/count/min/max per day x dimensions)")
+    run.add_argument("--rollup-date", default="date",
+                     help="date column of the result [default: date]")
+    run.add_argument("--rollup-value", default="total_amount",
+                     help="value column of the result [default: total_amount]")
+    run.add_argument("--rollup-by", default="category,location",
+                     help="comma-separated dimension columns "
+                          "[default: category,location]")
+    run.add_argument("--timings", action="store_true",
+                     help="report import and run time breakdown to stderr")
+
+    infer = sub.add_parser("infer", help="infer a template from a data sample")
+    infer.add_argument("source", type=Path, help="input CSV/JSON file")
+    infer.add_argument("-o", "--output", type=Path,
+                       help="template path "
+                            "[default: <dir>/templates/<stem>_meta.json]")
+    infer.add_argument("--sample-size", type=int, default=1000,
+                       help="number of rows to profile [default: 1000]")
+    infer.add_argument("--threshold", type=float, default=0.95,
+                       help="minimal parse rate for a typed column "
+                            "[default: 0.95]")
+
+    query = sub.add_parser("query", help="totals over a date range from a rollup")
+    query.add_argument("rollup", type=Path, help="Parquet rollup file")
+    query.add_argument("--from", dest="start", help="first day (inclusive)")
+    query.add_argument("--to", dest="end", help="last day (inclusive)")
+    query.add_argument("--by", default="",
+                       help="comma-separated dimensions [default: grand total]")
+
+    sub.add_parser("imports", help="report import-time breakdown and exit")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "imports":
+        try:
+            timings = import_breakdown()
+        except ImportError as e:
+            print(f"databridge: {type(e).__name__}: {e}", file=sys.stderr)
+            return 1
+        print_timings(timings, "import time")
+        return 0
+
+    if args.command == "infer":
+        if not args.source.exists():
+            print(f"databridge: file not found: {args.source}", file=sys.stderr)
+            return 1
+        from template_manager import save_inferred_template
+        out = save_inferred_template(args.source, args.output,
+                                     sample_size=args.sample_size,
+                                     threshold=args.threshold)
+        print(f"Template saved to {out}", file=sys.stderr)
+        return 0
+
+    if args.command == "query":
+        if not args.rollup.exists():
+            print(f"databridge: file not found: {args.rollup}", file=sys.stderr)
+            return 1
+        by = tuple(d for d in args.by.split(",") if d)
+        try:
+            import pandas as pd
+            from etl import query_rollup
+            result = query_rollup(pd.read_parquet(args.rollup), args.start, args.end, by)
+        except Exception as e:
+            print(f"databridge: {type(e).__name__}: {e}", file=sys.stderr)
+            return 1
+        write_df(result, None)
+        return 0
+
+    template_path = args.template or default_template_path(args.sources[0])
+    for path in (template_path, *args.sources):
+        if not path.exists():
+            print(f"databridge: file not found: {path}", file=sys.stderr)
+            return 1
+
+    # pandas imports pyarrow itself when available, so pyarrow goes first
+    modules = ("pyarrow",) + HEAVY_MODULES if args.engine == "arrow" else HEAVY_MODULES
+    timings: List[Tuple[str, float]] = []
+    start = time.perf_counter()
+    try:
+        if args.timings:
+            timings = import_breakdown(modules)
+            start = time.perf_counter()
+        rows, rejected = run_job(args.sources, template_path, args.output,
+                                 drop_duplicates=args.drop_duplicates,
+                                 quarantine=args.quarantine,
+                                 max_error_rate=args.max_error_rate,
+                                 engine=args.engine,
+                                 rollup=args.rollup,
+                                 rollup_spec=(args.rollup_date, args.rollup_value,
+                                              tuple(d for d in args.rollup_by.split(",") if d)))
+    except Exception as e:
+        print(f"databridge: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    timings.append(("run", time.perf_counter() - start))
+
+    if args.output is not None:
+        print(f"{rows} rows written to {args.output}", file=sys.stderr)
+    if args.quarantine is not None:
+        print(f"{rejected} rows quarantined to {args.quarantine}", file=sys.stderr)
+    elif args.max_error_rate is not None:
+        print(f"{rejected} rows rejected (kept with empty values)", file=sys.stderr)
+    if args.timings:
+        print_timings(timings, "time breakdown")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -139,6 +139,6 @@ menu_actions = {
         }),
 }
 
-
-DevMenu(menu_actions, title="DevTools Menu").run()  # type: ignore
+if __name__ == "__main__":
+    DevMenu(menu_actions, title="DevTools Menu").run()  # type: ignore
 
@@ -1,49 +1,148 @@
 from pathlib import Path
 from typing import Any
-from getdata import read_data, normalize_column, detect_format
+from getdata import (read_data, normalize_column, detect_format, coercion_failures,
+                     normalize_column_arrow, coercion_failures_arrow, parse_dates)
 
+import hashlib
 import json
+import os
 import pandas as pd
 
 
-def create_df_from_file(file_path: Path, template: dict, drop_duplicates: bool = False) -> pd.DataFrame:
+# template type names -> normalize_column dtypes (same as MetaEditor.TYPES)
+TYPES = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "date": "date",
+}
+
+
+class ValidationError(ValueError):
+    """Raised when the share of rejected rows exceeds the allowed error rate."""
+
+
+def normalize_raw(raw: Any, template: dict) -> tuple[pd.DataFrame, Any, pd.DataFrame]:
+    """
+    Normalizes raw rows column by column according to template.
+
+    Args:
+        raw: Data as returned by read_data: list of dicts, or pyarrow.Table
+            for engine="arrow" (normalized by normalize_raw_arrow).
+        template: Template dict from MetaEditor.
+
+    Returns:
+        (df, source, failures): normalized DataFrame, source data
+        (DataFrame, or the pyarrow.Table itself for Arrow input; see
+        source_rows) and boolean coercion-failure masks (one column per
+        target column).
+
+    Raises:
+        ValueError: if a column can't be normalized at all (template error,
+            e.g. invalid format); per-value failures only go to the masks.
+    """
+    if not isinstance(raw, list):
+        return normalize_raw_arrow(raw, template)
+
+    source = pd.DataFrame(raw)
+    df_dict: dict[str, pd.Series] = {}
+    failures: dict[str, pd.Series] = {}
+
+    for col_name, col_spec in template.items():
+        if not col_spec.get("save", False):
+            continue
+        target = col_spec["target_name"]
+        if col_name in source:
+            values = source[col_name]
+        else:
+            values = pd.Series([None] * len(source), index=source.index, dtype=object)
+
+        try:
+            normalized = normalize_column(
+                values,
+                target_name=target,
+                dtype=TYPES.get(col_spec["type"], col_spec["type"]),
+                format_spec=col_spec.get("format"),
+                header_case=col_spec.get("header_case")
+            )
+        except Exception as e:
+            # template/config errors abort: only per-value coercion is a failure
+            raise ValueError(f"column '{col_name}' ({col_spec['type']}): {e}") from e
+
+        df_dict[target] = normalized
+        failures[target] = coercion_failures(values, normalized)
+
+    return (pd.DataFrame(df_dict, index=source.index),
+            source,
+            pd.DataFrame(failures, index=source.index, dtype=bool))
+
+
+def normalize_raw_arrow(table: Any, template: dict) -> tuple[pd.DataFrame, Any, pd.DataFrame]:
+    """
+    Arrow counterpart of normalize_raw: columns are normalized with
+    pyarrow.compute kernels and handed to pandas as ArrowDtype columns.
+    The source table is returned as is; it is converted to pandas only
+    for quarantined rows (source_rows).
+    """
+    import pyarrow as pa
+
+    columns: dict[str, Any] = {}
+    failures: dict[str, Any] = {}
+
+    for col_name, col_spec in template.items():
+        if not col_spec.get("save", False):
+            continue
+        target = col_spec["target_name"]
+        if col_name in table.column_names:
+            values = table.column(col_name)
+        else:
+            values = pa.nulls(table.num_rows, pa.string())
+
+        try:
+            normalized = normalize_column_arrow(
+                values,
+                dtype=TYPES.get(col_spec["type"], col_spec["type"]),
+                format_spec=col_spec.get("format")
+            )
+        except Exception as e:
+            raise ValueError(f"column '{col_name}' ({col_spec['type']}): {e}") from e
+
+        columns[target] = normalized
+        failures[target] = coercion_failures_arrow(values, normalized)
+
+    df = pa.table(columns).to_pandas(types_mapper=pd.ArrowDtype)
+    return df, table, pa.table(failures).to_pandas().astype(bool)
+
+
+def source_rows(source: Any, mask: pd.Series) -> pd.DataFrame:
+    """Rows of source data (DataFrame or pyarrow.Table) selected by a boolean mask."""
+    if isinstance(source, pd.DataFrame):
+        return source[mask.to_numpy()]
+    import pyarrow as pa
+
+    rows = source.filter(pa.array(mask.to_numpy()))
+    return rows.to_pandas(types_mapper=pd.ArrowDtype).set_axis(mask.index[mask.to_numpy()])
+
+
+def create_df_from_file(file_path: Path, template: dict, drop_duplicates: bool = False,
+                        engine: str = "python") -> pd.DataFrame:
     """
     Creates a DataFrame from file based on MetaEditor template.
+    Values that can't be converted are set to None (see validate_df_from_file
+    to separate such rows instead).
 
     Args:
         file_path: Path to the input data file.
         template: Template dict from MetaEditor.
         drop_duplicates: If True, duplicate rows will be removed.
+        engine: "python" or "arrow" (pyarrow-backed columns, see read_data).
 
     Returns:
         pd.DataFrame
     """
-    fmt, raw = read_data(file_path)  # returns (format, list[dict])
-    df_dict = {col_spec["target_name"]: [] for col_spec in template.values() if col_spec.get("save", False)}
-
-    for row in raw:
-        for col_name, col_spec in template.items():
-            if not col_spec.get("save", False):
-                continue
-            value = row.get(col_name, None)
-
-            try:
-                # normalize_column always expects a Series
-                series = pd.Series([value])
-                normalized = normalize_column(
-                    series,
-                    target_name=col_spec["target_name"],
-                    dtype=col_spec["type"],
-                    format_spec=col_spec.get("format"),
-                    header_case=col_spec.get("header_case")
-                )
-                val = normalized.iloc[0] if not normalized.empty else None
-            except Exception:
-                val = None
-
-            df_dict[col_spec["target_name"]].append(val)
-
-    df = pd.DataFrame(df_dict)
+    fmt, raw = read_data(file_path, engine=engine)  # returns (format, list[dict] | pyarrow.Table)
+    df, _, _ = normalize_raw(raw, template)
 
     if drop_duplicates:
         df = df.drop_duplicates(ignore_index=True)
@@ -51,8 +150,70 @@ def create_df_from_file(file_path: Path, template: dict, drop_duplicates: bool =
     return df
 
 
+def validate_df_from_file(
+    file_path: Path,
+    template: dict,
+    drop_duplicates: bool = False,
+    max_error_rate: float | None = None,
+    engine: str = "python",
+    keep_rejected: bool = False
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Creates a DataFrame from file and moves rows with conversion failures
+    to a quarantine DataFrame.
+
+    Args:
+        file_path: Path to the input data file.
+        template: Template dict from MetaEditor.
+        drop_duplicates: If True, duplicate valid rows will be removed.
+        max_error_rate: Maximal allowed share of rejected rows (0..1).
+            If exceeded, ValidationError is raised.
+        engine: "python" or "arrow" (pyarrow-backed columns, see read_data).
+        keep_rejected: If True, rejected rows also stay in df with failed
+            values as None (as in create_df_from_file).
+
+    Returns:
+        (df, quarantine): valid normalized rows (all rows if keep_rejected); rejected rows with original
+        source values, their row number in the file ("_row") and reasons
+        ("_reasons", e.g. "price: not float; date: not date").
+    """
+    fmt, raw = read_data(file_path, engine=engine)
+    df, source, failures = normalize_raw(raw, template)
+
+    rejected = failures.any(axis=1)
+    error_rate = float(rejected.mean()) if len(rejected) else 0.0
+    if max_error_rate is not None and error_rate > max_error_rate:
+        counts = failures.sum()
+        details = ", ".join(f"{col}: {n}" for col, n in counts[counts > 0].items())
+        raise ValidationError(
+            f"{file_path}: {int(rejected.sum())} of {len(rejected)} rows rejected "
+            f"({error_rate:.1%} > {max_error_rate:.1%}); failures by column: {details}"
+        )
+
+    if not rejected.any():
+        quarantine = source_rows(source, rejected).assign(_row=pd.Series(dtype=int),
+                                                          _reasons=pd.Series(dtype=str))
+    else:
+        types = {spec["target_name"]: spec["type"]
+                 for spec in template.values() if spec.get("save", False)}
+        bad = failures[rejected]
+        reasons = pd.Series("", index=bad.index)
+        for col in bad.columns[bad.any()]:
+            reasons[bad[col]] += f"{col}: not {types[col]}; "
+        quarantine = source_rows(source, rejected).assign(_row=bad.index + 1,
+                                             _reasons=reasons.str.rstrip("; "))
+        quarantine = quarantine.reset_index(drop=True)
+        if not keep_rejected:
+            df = df[~rejected].reset_index(drop=True)
+
+    if drop_duplicates:
+        df = df.drop_duplicates(ignore_index=True)
+
+    return df, quarantine
 
-def append_df_from_file(df: pd.DataFrame, file_path: Path, template: dict, drop_duplicates: bool = False) -> pd.DataFrame:
+
+def append_df_from_file(df: pd.DataFrame, file_path: Path, template: dict, drop_duplicates: bool = False,
+                        engine: str = "python") -> pd.DataFrame:
     """
     Appends data from file to existing DataFrame according to template.
     Rows where all values are None are ignored.
@@ -62,11 +223,12 @@ def append_df_from_file(df: pd.DataFrame, file_path: Path, template: dict, drop_
         file_path: Path to the input data file.
         template: Template dict from MetaEditor.
         drop_duplicates: If True, duplicate rows will be removed after concatenation.
+        engine: "python" or "arrow" (pyarrow-backed columns, see read_data).
 
     Returns:
         pd.DataFrame
     """
-    new_df = create_df_from_file(file_path, template, drop_duplicates=False)
+    new_df = create_df_from_file(file_path, template, drop_duplicates=False, engine=engine)
     new_df = new_df.dropna(how="all")  # drop empty rows
 
     result = pd.concat([df, new_df], ignore_index=True)
@@ -77,6 +239,173 @@ def append_df_from_file(df: pd.DataFrame, file_path: Path, template: dict, drop_
     return result
 
 
+# --- Rollups ---
+# Pre-aggregated metrics per day x dimensions, so totals over a date range
+# don't need the full normalized frame. Stored as Parquet (pyarrow engine), with
+# ingested batch ids in the same file (DataFrame.attrs -> Parquet metadata).
+
+ROLLUP_METRICS = ("sum", "count", "min", "max")
+ROLLUP_DIMS = ("category", "location")
+
+
+def check_rollup_columns(df: pd.DataFrame, date_col: str, value_col: str,
+                         dims: tuple[str, ...] = ROLLUP_DIMS,
+                         rollup_path: Path | None = None) -> None:
+    """
+    Raises ValueError if df lacks any of the rollup columns, or if the
+    rollup stored at rollup_path (if it exists) has other dimensions.
+    """
+    missing = [c for c in (date_col, value_col, *dims) if c not in df.columns]
+    if missing:
+        raise ValueError(f"Rollup columns not found: {missing}; available: {list(df.columns)}")
+    if rollup_path is not None and rollup_path.exists():
+        check_rollup_schema(rollup_path, pd.read_parquet(rollup_path, engine="pyarrow"), dims)
+
+
+def check_rollup_schema(rollup_path: Path, rollup: pd.DataFrame, dims: tuple[str, ...]) -> None:
+    """Raises ValueError if a stored rollup has other columns than day x dims."""
+    diff = set(rollup.columns) ^ {"day", *dims, *ROLLUP_METRICS}
+    if diff:
+        raise ValueError(f"Rollup {rollup_path} has different dimensions: {sorted(diff)}")
+
+
+def build_rollup(df: pd.DataFrame, date_col: str, value_col: str,
+                 dims: tuple[str, ...] = ROLLUP_DIMS) -> pd.DataFrame:
+    """
+    Aggregates a normalized DataFrame to one row per day x dims.
+
+    Args:
+        df: Normalized DataFrame (e.g. from create_df_from_file).
+        date_col: Column with dates/timestamps (truncated to days).
+        value_col: Numeric column to aggregate (e.g. total amount).
+        dims: Grouping columns; missing values form their own group.
+
+    Returns:
+        pd.DataFrame with columns: day, *dims, sum, count, min, max.
+        Rows with invalid date or value are skipped.
+    """
+    check_rollup_columns(df, date_col, value_col, dims)
+    dates = df[date_col]
+    if not pd.api.types.is_datetime64_dtype(dates):
+        dates = parse_dates(dates.astype("string"))
+    frame = pd.DataFrame({
+        "day": dates.dt.normalize(),
+        **{d: df[d].astype("string") for d in dims},
+        "value": pd.to_numeric(df[value_col], errors="coerce").astype(float),
+    })
+    frame = frame.dropna(subset=["day", "value"])
+    rollup = frame.groupby(["day", *dims], dropna=False, sort=False)["value"].agg(list(ROLLUP_METRICS))
+    return rollup.reset_index()
+
+
+def merge_rollups(rollup: pd.DataFrame, update: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merges two rollups with the same dimensions.
+    Sums and counts are added, min/max are combined.
+    """
+    keys = [c for c in rollup.columns if c not in ROLLUP_METRICS]
+    merged = pd.concat([rollup, update], ignore_index=True)
+    merged = merged.groupby(keys, dropna=False).agg(
+        sum=("sum", "sum"), count=("count", "sum"), min=("min", "min"), max=("max", "max")
+    )
+    return merged.reset_index()
+
+
+def batch_id(paths: list[Path]) -> str:
+    """
+    Identity of an input batch: SHA-256 over resolved paths and file contents.
+
+    Any change of a file gives a new id: a source with appended rows is a
+    new batch and is counted again in full, so rollups expect each batch
+    of new rows in a new file.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p).resolve() for p in paths):
+        digest.update(str(path).encode("utf-8"))
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def update_rollup(rollup_path: Path, df: pd.DataFrame, date_col: str, value_col: str,
+                  dims: tuple[str, ...] = ROLLUP_DIMS, batch: str | None = None) -> pd.DataFrame:
+    """
+    Adds a new batch to the rollup stored at rollup_path (created if missing).
+
+    Only the batch is aggregated; the stored rollup is merged with it.
+    Aggregates and ingested batch ids (attrs["batches"]) are written together
+    to a temporary file which then replaces the rollup, so an interrupted run
+    leaves either the old or the new state.
+
+    Args:
+        batch: Batch identity (e.g. batch_id(source_paths)). Batches already
+            ingested are skipped, so retried runs are not counted twice.
+            None = always add.
+
+    Returns:
+        Updated (or unchanged, for a skipped batch) rollup DataFrame.
+    """
+    batches: list[str] = []
+    rollup = None
+    if rollup_path.exists():
+        rollup = pd.read_parquet(rollup_path, engine="pyarrow")
+        batches = list(rollup.attrs.get("batches", []))
+        if batch is not None and batch in batches:
+            return rollup
+        check_rollup_schema(rollup_path, rollup, dims)
+
+    update = build_rollup(df, date_col, value_col, dims)
+    if rollup is not None:
+        update = merge_rollups(rollup, update)
+    if batch is not None:
+        batches.append(batch)
+    update.attrs["batches"] = batches
+
+    rollup_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = rollup_path.with_name(rollup_path.name + ".tmp")
+    update.to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, rollup_path)
+    return update
+
+
+def query_rollup(rollup: pd.DataFrame, start: str | None = None, end: str | None = None,
+                 by: tuple[str, ...] = ()) -> pd.DataFrame:
+    """
+    Totals over a date range answered from a rollup.
+
+    Args:
+        rollup: Rollup DataFrame (build_rollup / update_rollup / pd.read_parquet).
+        start, end: Inclusive date bounds (any pandas-parsable date), None = open.
+        by: Dimensions to keep (e.g. ("category",)); empty = grand total.
+
+    Returns:
+        pd.DataFrame with columns: *by, sum, count, min, max, mean.
+
+    Raises:
+        ValueError: if by names columns that are not rollup dimensions.
+    """
+    dims = [c for c in rollup.columns if c not in ("day", *ROLLUP_METRICS)]
+    unknown = [d for d in by if d not in dims]
+    if unknown:
+        raise ValueError(f"Unknown rollup dimensions: {unknown}; available: {dims}")
+
+    mask = pd.Series(True, index=rollup.index)
+    if start is not None:
+        mask &= rollup["day"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= rollup["day"] <= pd.Timestamp(end)
+    selected = rollup[mask]
+
+    metrics = dict(sum=("sum", "sum"), count=("count", "sum"), min=("min", "min"), max=("max", "max"))
+    if by:
+        result = selected.groupby(list(by), dropna=False).agg(**metrics).reset_index()
+    else:
+        result = selected.assign(_all=0).groupby("_all").agg(**metrics).reset_index(drop=True)
+        if result.empty:
+            result = pd.DataFrame({"sum": [0.0], "count": [0], "min": [None], "max": [None]})
+    result["mean"] = result["sum"] / result["count"].where(result["count"] > 0)
+    return result
+
+
 def load_template(template_path: Path) -> dict:
     """
     Loads template JSON as dict.
@@ -1,11 +1,19 @@
 from custom_types import DemoError
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Tuple, Optional
+from typing import Any, Tuple, Optional
 
 import csv
 import json
 import pandas as pd
+import re
+
+
+# string markers treated as missing values
+NULL_VALUES = {"", "null", "nan", "n/a", "-", "none"}
+# |value| must stay below this to fit int64
+INT64_LIMIT = 2 ** 63
+INT64_DIGITS = str(INT64_LIMIT - 1)
 
 
 def detect_format(path: Path) -> str:
@@ -19,8 +27,13 @@ def detect_format(path: Path) -> str:
         return "unknown"
 
 
-def read_data(path: Path) -> Tuple[str, List[dict[str, Any]]]:
-    """Read data from a CSV or JSON file depending on detected format."""
+def read_data(path: Path, engine: str = "python") -> Tuple[str, Any]:
+    """
+    Read data from a CSV or JSON file depending on detected format.
+
+    engine="python" returns a list of dicts, engine="arrow" a pyarrow.Table
+    (see read_arrow).
+    """
 
     fmt = detect_format(path)
 
@@ -31,6 +44,11 @@ def read_data(path: Path) -> Tuple[str, List[dict[str, Any]]]:
             f"streaming read for large files (>10 MB) in format '{fmt}'"
         )
 
+    if engine == "arrow":
+        return fmt, read_arrow(path, fmt)
+    elif engine != "python":
+        raise ValueError(f"Unknown engine: {engine}")
+
     if fmt == "json":
         with path.open("r", encoding="utf-8") as f:
             return fmt, json.load(f)
@@ -122,6 +140,16 @@ def normalize_text(val: str) -> Optional[str]:
     return val
 
 
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Vectorized date parsing shared by normalization and template inference.
+    "mixed": every value gets its own format. Unlike parse_date (dayfirst=True)
+    it is month-first: "05/01/2024" -> May 1; day-first only when the
+    month-first reading is invalid ("24/11/2023").
+    """
+    return pd.to_datetime(values, errors="coerce", format="mixed")
+
+
 def normalize_column(values: pd.Series, target_name: str, dtype: type,
                      format_spec: str = None, header_case: str = None) -> pd.Series:
     """
@@ -129,7 +157,7 @@ def normalize_column(values: pd.Series, target_name: str, dtype: type,
 
     - values: original column values
     - target_name: target header name
-    - dtype: target type (str, int, float, date)
+    - dtype: target type (str, int, float, bool, date)
     - format_spec: formatting string, e.g. ":.2f" or date format
     - header_case: 'lower', 'capitalize', 'title', 'upper' for column name normalization
 
@@ -147,18 +175,39 @@ def normalize_column(values: pd.Series, target_name: str, dtype: type,
     if dtype == "numeric":
         series = pd.to_numeric(series, errors="coerce")
     elif dtype == int:
-        series = pd.to_numeric(series, errors="coerce").astype("Int64")
+        numbers = pd.to_numeric(series, errors="coerce")
+        if pd.api.types.is_signed_integer_dtype(numbers):
+            series = numbers.astype("Int64")  # clean int64 column: already exact
+        else:
+            # integer strings are cast directly (float64 is exact only up to 2**53)
+            text = series.astype("string").str.strip()
+            int_text = text.str.replace(r"^\+?(-?)0*(\d)", r"\1\2", regex=True)
+            digits = int_text.str.lstrip("-")
+            is_int = int_text.str.fullmatch(r"-?\d{1,19}").fillna(False).to_numpy(dtype=bool)
+            short = (digits.str.len() < 19).fillna(False).to_numpy(dtype=bool)
+            in_range = (digits <= INT64_DIGITS).fillna(False).to_numpy(dtype=bool)
+            exact = pd.Series(is_int & (short | in_range), index=series.index)
+            # decimal/exponent forms go through float; non-integral or
+            # out-of-int64-range numbers are invalid values, not a column error
+            numbers = pd.to_numeric(series.where(~exact), errors="coerce").astype(float)
+            valid = (numbers % 1 == 0) & numbers.abs().lt(INT64_LIMIT)
+            result = numbers.where(valid).astype("Int64")
+            result[exact] = int_text[exact].astype("Int64")
+            series = result
     elif dtype == float:
         series = pd.to_numeric(series, errors="coerce").astype(float)
         if format_spec:
+            spec = format_spec.lstrip(":")
             series = series.map(
-                lambda x: format(x, format_spec) if pd.notnull(x) else x
+                lambda x: format(x, spec) if pd.notnull(x) else x
             )
     elif dtype == str:
         series = series.astype(str)
+    elif dtype == bool:
+        series = series.map(parse_bool).astype("boolean")
     elif dtype == "date" or dtype.__name__ == "date":
         # convert to datetime
-        series = pd.to_datetime(series, errors="coerce")
+        series = parse_dates(series)
         if format_spec:
             series = series.dt.strftime(format_spec)
     else:
@@ -167,9 +216,147 @@ def normalize_column(values: pd.Series, target_name: str, dtype: type,
     return series
 
 
+def coercion_failures(values: pd.Series, normalized: pd.Series) -> pd.Series:
+    """
+    Boolean mask of values that were present in the source
+    but became missing after normalize_column.
+    """
+    failed = normalized.isna()
+    if not failed.any():
+        return failed  # clean column: no string checks needed
+    # only missing results are checked against source null markers
+    candidates = values[failed]
+    present = candidates.notna() & ~candidates.astype(str).str.strip().str.lower().isin(NULL_VALUES)
+    failed.loc[candidates.index] = present.to_numpy()
+    return failed
+
+
 # --- normalize dataframe ---
 def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
     df_norm = df.copy()
     for col in df_norm.columns:
         df_norm[col] = df_norm[col].apply(lambda v: normalize_value(v, col))
     return df_norm
+
+
+# --- Arrow engine ---
+# pyarrow is optional: imported only when engine="arrow" is used
+
+NUMBER_PATTERN = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+# same day/month order as parse_dates (dateutil, dayfirst=False):
+# month first, day first only when the month-first reading is invalid
+DATE_FORMATS = (
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y/%m/%d",
+    "%m/%d/%Y", "%m-%d-%Y", "%m.%d.%Y",
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%b %d %Y", "%B %d %Y", "%b %d, %Y", "%B %d, %Y",
+    "%d %b %Y", "%d %B %Y",
+)
+
+
+def read_arrow(path: Path, fmt: str):
+    """
+    Read a CSV or JSON file into a pyarrow.Table.
+
+    CSV columns are read as strings (no type inference), so normalization
+    sees the raw values. JSON records with mixed value types per key are
+    read as strings as well.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    if fmt == "csv":
+        with path.open("r", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        options = pa_csv.ConvertOptions(column_types={h: pa.string() for h in header})
+        return pa_csv.read_csv(path, convert_options=options)
+    elif fmt == "json":
+        with path.open("r", encoding="utf-8") as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = [rows]
+        # DataFrame takes the union of keys over all records
+        # (pa.Table.from_pylist would use the first record only)
+        frame = pd.DataFrame(rows)
+        try:
+            return pa.Table.from_pandas(frame, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.Table.from_pandas(frame.astype(str).where(frame.notna()),
+                                        preserve_index=False)
+    else:
+        raise ValueError(f"Unsupported file format: {path}")
+
+
+def normalize_column_arrow(values, dtype: type, format_spec: str = None):
+    """
+    Arrow counterpart of normalize_column built on pyarrow.compute kernels.
+
+    - values: pyarrow (Chunked)Array
+    - dtype: target type (str, int, float, bool, date, "numeric")
+    - format_spec: float format (e.g. ".2f") or strftime format for dates
+
+    Returns a pyarrow array; values that can't be converted become null.
+    Date strings are tried against DATE_FORMATS in order.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)):
+        values = pc.cast(values, pa.string())
+    text = pc.utf8_trim_whitespace(values)
+
+    if dtype in ("numeric", int, float):
+        valid = pc.match_substring_regex(text, NUMBER_PATTERN)
+        numbers = pc.cast(pc.if_else(valid, text, pa.scalar(None, pa.string())), pa.float64())
+        if dtype == int:
+            # integer strings are cast directly (float64 is exact only up to 2**53)
+            int_text = pc.replace_substring_regex(text, r"^\+?(-?)0*(\d)", r"\1\2")
+            is_int = pc.match_substring_regex(int_text, r"^-?\d{1,19}$")
+            digits = pc.utf8_ltrim(int_text, characters="-")
+            fits = pc.or_(pc.less(pc.utf8_length(digits), 19),
+                          pc.less_equal(digits, INT64_DIGITS))
+            exact = pc.cast(pc.if_else(pc.and_(is_int, fits), int_text,
+                                       pa.scalar(None, pa.string())), pa.int64())
+            # decimal/exponent forms go through float64
+            integral = pc.and_(pc.equal(pc.floor(numbers), numbers),
+                               pc.less(pc.abs(numbers), float(INT64_LIMIT)))
+            rounded = pc.cast(pc.if_else(integral, numbers, pa.scalar(None, pa.float64())), pa.int64())
+            return pc.if_else(is_int, exact, rounded)
+        if dtype == float and format_spec:
+            # no formatting kernel in Arrow: format in Python, only when asked to
+            spec = format_spec.lstrip(":")
+            return pa.array([None if x is None else format(x, spec)
+                             for x in numbers.to_pylist()], pa.string())
+        return numbers
+    elif dtype == str:
+        return text
+    elif dtype == bool:
+        lowered = pc.utf8_lower(text)
+        is_true = pc.is_in(lowered, value_set=pa.array(["true", "yes", "y", "1"]))
+        is_false = pc.is_in(lowered, value_set=pa.array(["false", "no", "n", "0"]))
+        return pc.if_else(is_true, True,
+                          pc.if_else(is_false, False, pa.scalar(None, pa.bool_())))
+    elif dtype == "date" or getattr(dtype, "__name__", None) == "date":
+        parsed = pc.coalesce(*(
+            pc.strptime(text, format=f, unit="s", error_is_null=True)
+            for f in DATE_FORMATS
+        ))
+        if format_spec:
+            return pc.strftime(parsed, format=format_spec)
+        return parsed
+    return values  # fallback, leave as-is
+
+
+def coercion_failures_arrow(values, normalized):
+    """Arrow counterpart of coercion_failures: boolean pyarrow array."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    missing = pc.is_null(normalized)
+    if not pc.any(missing).as_py():
+        return missing  # clean column: no string checks needed
+    text = pc.utf8_lower(pc.utf8_trim_whitespace(pc.cast(values, pa.string())))
+    blank = pc.is_in(text, value_set=pa.array(sorted(NULL_VALUES)))
+    present = pc.and_(pc.is_valid(values), pc.invert(blank))
+    return pc.and_(missing, present)
@@ -1,5 +1,5 @@
 from devmenu import DevMenu
-from getdata import normalize_column, detect_format
+from getdata import normalize_column, detect_format, read_data, parse_dates, NULL_VALUES
 from pathlib import Path
 
 import json
@@ -12,6 +12,7 @@ class MetaEditor:
         "str": str,
         "int": int,
         "float": float,
+        "bool": bool,
         "date": "date",
     }
 
@@ -65,12 +66,20 @@ class MetaEditor:
             except Exception:
                 print(f"Warning: could not load template {self.template_path}")
 
+    def infer_meta(self, sample_size: int = 1000, threshold: float = 0.95):
+        """Fill meta with types inferred from a bounded sample of the file."""
+        inferred = infer_template(load_sample(self.file_path, sample_size), threshold)
+        for h, m in inferred.items():
+            if h in self.meta:
+                self.meta[h].update(m)
+
     def show_headers(self):
         print(f"\nEditing file: {self.file_path}\n")
         print("Current headers and metadata:")
         for h, m in self.meta.items():
             save_mark = "\033[92m[S]\033[0m" if m.get("save") else "[ ]"  # зеленый [S] или пустой [ ]
-            print(f"{h} {save_mark} → type={m['type']}, format={m['format']}, header_case={m['header_case']}")
+            key_mark = " [key]" if m.get("profile", {}).get("key") else ""
+            print(f"{h} {save_mark} → type={m['type']}, format={m['format']}, header_case={m['header_case']}{key_mark}")
         print()
 
     def edit_header(self):
@@ -98,7 +107,7 @@ class MetaEditor:
 
             # --- Type and format ---
             default_type = col_meta["type"]
-            dtype_input = input(f"Type (str,int,float,date) [default={default_type}]: ").strip()
+            dtype_input = input(f"Type (str,int,float,bool,date) [default={default_type}]: ").strip()
             if dtype_input in self.TYPES:
                 col_meta["type"] = dtype_input
 
@@ -131,6 +140,120 @@ class MetaEditor:
             json.dump(save_meta, f, ensure_ascii=False, indent=2)
 
 
+# --- Template inference ----------------------------------------------------
+# "1"/"0" are left out on purpose: such columns are numeric, not flags
+BOOL_VALUES = {"true", "false", "yes", "no", "y", "n"}
+# cheap pre-filter: only strings like "2024-01-05", "05/01/2024", "Jan 7 2024"
+# reach the (per-value) date parser
+DATE_LIKE = r"\d{1,4}[-/.]\d{1,2}|[A-Za-z]{3,9}\.? \d{1,2}|\d{1,2} [A-Za-z]{3,9}"
+
+
+def load_sample(file_path: Path, sample_size: int = 1000) -> pd.DataFrame:
+    """
+    Read the first sample_size rows (file head) of a CSV/JSON file as raw strings.
+    Missing values are kept as NaN.
+    """
+    fmt = detect_format(file_path)
+    if fmt == "csv":
+        return pd.read_csv(file_path, nrows=sample_size, dtype=str)
+    elif fmt == "json":
+        _, rows = read_data(file_path)
+        if isinstance(rows, dict):
+            rows = [rows]
+        sample = pd.DataFrame(rows[:sample_size])
+        return sample.astype(str).where(sample.notna())
+    raise ValueError(f"Unsupported file format: {file_path}")
+
+
+def profile_column(values: pd.Series) -> dict[str, Any]:
+    """
+    Profile a column of raw strings in one vectorized pass.
+
+    Returns null ratio, cardinality, parse rates (share of non-null values
+    convertible to number/date/bool), whether all numbers are integral,
+    and whether the column is a likely key (unique, no nulls).
+    """
+    text = values.astype("string").str.strip()
+    lowered = text.str.lower()
+    present = text[~lowered.isin(NULL_VALUES) & text.notna()]
+    total = len(values)
+    count = len(present)
+
+    profile: dict[str, Any] = {
+        "null_ratio": round(1 - count / total, 4) if total else 1.0,
+        "cardinality": int(present.nunique()),
+        "numeric_rate": 0.0,
+        "date_rate": 0.0,
+        "bool_rate": 0.0,
+        "integral": False,
+        "key": False,
+    }
+    if not count:
+        return profile
+
+    numbers = pd.to_numeric(present, errors="coerce")
+    parsed = numbers.dropna()
+    profile["numeric_rate"] = round(len(parsed) / count, 4)
+    profile["integral"] = bool(len(parsed)) and bool((parsed % 1 == 0).all())
+    profile["bool_rate"] = round(float(lowered[present.index].isin(BOOL_VALUES).mean()), 4)
+    # only non-numeric, date-like strings are tried as dates ("150" is not a date)
+    candidates = present[numbers.isna().to_numpy() & present.str.contains(DATE_LIKE).to_numpy()]
+    if len(candidates):
+        dates = parse_dates(candidates)
+        profile["date_rate"] = round(int(dates.notna().sum()) / count, 4)
+    profile["key"] = total > 1 and profile["cardinality"] == total
+    return profile
+
+
+def infer_type(profile: dict[str, Any], threshold: float = 0.95) -> str:
+    """
+    Pick the tightest template type whose parse rate reaches threshold.
+
+    Numbers are "int" only for integral key columns (ids): the sample is the
+    file head, and "int" rejects a later "12.50", so other numeric columns
+    are "float" (switch to "int" in MetaEditor if needed).
+    """
+    if profile["bool_rate"] >= threshold:
+        return "bool"
+    if profile["numeric_rate"] >= threshold:
+        return "int" if profile["integral"] and profile["key"] else "float"
+    if profile["date_rate"] >= threshold:
+        return "date"
+    return "str"
+
+
+def infer_template(sample: pd.DataFrame, threshold: float = 0.95) -> dict[str, dict[str, Any]]:
+    """
+    Build a MetaEditor template from a data sample.
+
+    Every column gets an inferred type, "save": true and its profile,
+    so the editor only needs to confirm or adjust.
+    """
+    template: dict[str, dict[str, Any]] = {}
+    for h in sample.columns:
+        profile = profile_column(sample[h])
+        template[h] = {
+            "target_name": h,
+            "type": infer_type(profile, threshold),
+            "format": None,
+            "header_case": None,
+            "save": True,
+            "profile": profile,
+        }
+    return template
+
+
+def save_inferred_template(file_path: Path, out: Path | None = None,
+                           sample_size: int = 1000, threshold: float = 0.95) -> Path:
+    """Infer a template for file_path and save it next to other templates."""
+    template = infer_template(load_sample(file_path, sample_size), threshold)
+    out = out or file_path.parent / "templates" / (file_path.stem + "_meta.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8") as f:
+        json.dump(template, f, ensure_ascii=False, indent=2)
+    return out
+
+
 # --- Helper to run editor --------------------------------------------------
 def run_metaeditor(filename: str):
     # всегда внутри Data/
@@ -202,6 +325,7 @@ def select_or_create_template(filename: str) -> Path | None:
         choice = input("> ").strip()
         if choice == "1":
             editor = MetaEditor(data_path / filename)
+            editor.infer_meta()
             editor.edit_header()
             save = input(f"Save new template for '{filename}'? [y/N]: ").strip().lower()
             if save == "y":
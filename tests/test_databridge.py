@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import subprocess
+import sys
+
+from databridge import HEAVY_MODULES, import_breakdown, main
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, databridge\n"
+        "heavy = [m for m in ('pandas', 'pyarrow', 'getdata', 'etl') if m in sys.modules]\n"
+        "print(','.join(heavy))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_help_does_not_load_pandas():
+    code = (
+        "import sys, databridge\n"
+        "try:\n"
+        "    databridge.main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().endswith("False")
+
+
+def test_import_breakdown_reports_each_module():
+    timings = import_breakdown()
+    assert [name for name, _ in timings] == list(HEAVY_MODULES)
+    assert all(seconds >= 0 for _, seconds in timings)
+
+
+def test_imports_command(capsys):
+    assert main(["imports"]) == 0
+    err = capsys.readouterr().err
+    for name in HEAVY_MODULES:
+        assert name in err
+    assert "total" in err
+
+
+def test_imports_command_reports_import_errors(capsys, monkeypatch):
+    monkeypatch.setattr("databridge.import_breakdown.__defaults__", (("no_such_module_xyz",),))
+    assert main(["imports"]) == 1
+    assert "No module named 'no_such_module_xyz'" in capsys.readouterr().err
@@ -0,0 +1,335 @@
+from pathlib import Path
+
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from etl import (ValidationError, batch_id, build_rollup, create_df_from_file,
+                 query_rollup, update_rollup, validate_df_from_file)
+
+DATA = Path(__file__).resolve().parent.parent / "Data"
+
+
+def spec(target: str, dtype: str, fmt: str | None = None) -> dict:
+    return {"target_name": target, "type": dtype, "format": fmt,
+            "header_case": None, "save": True}
+
+
+SALES_TEMPLATE = {
+    "date": spec("date", "date"),
+    "product_category": spec("category", "str"),
+    "quantity": spec("quantity", "int"),
+    "total_amount": spec("total_amount", "float"),
+}
+
+
+@pytest.fixture
+def dirty_csv(tmp_path: Path) -> Path:
+    path = tmp_path / "dirty.csv"
+    path.write_text(
+        "date,product_category,quantity,total_amount\n"
+        "2024-01-05,Beauty,3,150\n"
+        "not a date,Clothing,2,1000\n"
+        "2024-01-07,Beauty,2.5,abc\n"
+        "2024-01-08,Beauty,n/a,\n"
+        "2024-01-09,Electronics,1,30\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_validate_quarantines_rows_with_reasons(dirty_csv):
+    df, quarantine = validate_df_from_file(dirty_csv, SALES_TEMPLATE)
+
+    # null markers are missing values, not failures
+    assert len(df) == 3
+    assert df["quantity"].isna().sum() == 1
+    assert list(quarantine["_row"]) == [2, 3]
+    assert list(quarantine["_reasons"]) == [
+        "date: not date",
+        "quantity: not int; total_amount: not float",
+    ]
+    # quarantine keeps the original source values
+    assert list(quarantine["total_amount"]) == ["1000", "abc"]
+
+
+def test_create_keeps_failed_values_as_missing(dirty_csv):
+    df = create_df_from_file(dirty_csv, SALES_TEMPLATE)
+    assert len(df) == 5
+    assert df["date"].isna().sum() == 1
+    assert df["total_amount"].isna().sum() == 2
+
+
+def test_max_error_rate_aborts(dirty_csv):
+    with pytest.raises(ValidationError, match="2 of 5 rows rejected"):
+        validate_df_from_file(dirty_csv, SALES_TEMPLATE, max_error_rate=0.2)
+    df, quarantine = validate_df_from_file(dirty_csv, SALES_TEMPLATE, max_error_rate=0.4)
+    assert len(quarantine) == 2
+
+
+def test_template_error_aborts_instead_of_blanking_column(dirty_csv):
+    template = dict(SALES_TEMPLATE, total_amount=spec("total_amount", "float", "%.2f"))
+    with pytest.raises(ValueError, match="column 'total_amount'"):
+        validate_df_from_file(dirty_csv, template)
+
+
+def test_clean_data_has_no_failures():
+    df, quarantine = validate_df_from_file(DATA / "sales.csv", SALES_TEMPLATE)
+    assert len(df) == 1000
+    assert quarantine.empty
+    assert str(df["quantity"].dtype) == "Int64"
+
+
+@pytest.mark.parametrize("engine", ["python", "arrow"])
+def test_out_of_range_int_is_quarantined(tmp_path, engine):
+    if engine == "arrow":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / "big.csv"
+    path.write_text("id,q\na,1\nb,99999999999999999999\nc,1e30\nd,7\n", encoding="utf-8")
+    df, quarantine = validate_df_from_file(path, {"q": spec("q", "int")}, engine=engine)
+    assert as_values(df["q"]) == [1, 7]
+    assert list(quarantine["_row"]) == [2, 3]
+    assert set(quarantine["_reasons"]) == {"q: not int"}
+
+
+def test_max_error_rate_without_quarantine_keeps_rows(dirty_csv, tmp_path, capsys):
+    from databridge import main
+
+    template = tmp_path / "meta.json"
+    template.write_text(json.dumps(SALES_TEMPLATE), encoding="utf-8")
+    output = tmp_path / "out.csv"
+    assert main(["run", str(dirty_csv), "-t", str(template), "-o", str(output),
+                 "--max-error-rate", "0.5"]) == 0
+    assert len(pd.read_csv(output)) == 5
+    assert "2 rows rejected" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(not os.environ.get("DATABRIDGE_BENCH"),
+                    reason="benchmark: set DATABRIDGE_BENCH=1 to run")
+def test_validation_overhead_on_clean_data(tmp_path):
+    """validate_df_from_file vs create_df_from_file end to end on clean data."""
+    path = tmp_path / "sales_x20.csv"
+    lines = (DATA / "sales.csv").read_text(encoding="utf-8").splitlines()
+    path.write_text("\n".join(lines[:1] + lines[1:] * 20) + "\n", encoding="utf-8")
+
+    def best_of(fn, repeat: int = 7) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    baseline = best_of(lambda: create_df_from_file(path, SALES_TEMPLATE))
+    validated = best_of(lambda: validate_df_from_file(path, SALES_TEMPLATE))
+    print(f"create {baseline * 1000:.1f} ms, validate {validated * 1000:.1f} ms "
+          f"({validated / baseline - 1:+.1%})")
+    assert validated < baseline * 1.25
+
+
+# --- Arrow engine ---
+
+def as_values(series: pd.Series) -> list:
+    """Engine-independent cell values: missing -> None, timestamps as pd.Timestamp."""
+    return [None if pd.isna(v) else (pd.Timestamp(v) if hasattr(v, "year") else v)
+            for v in series.tolist()]
+
+
+@pytest.fixture
+def mixed_csv(tmp_path: Path) -> Path:
+    path = tmp_path / "mixed.csv"
+    path.write_text(
+        "id,day,amount,flag,name\n"
+        "1,05/01/2024,5.5,yes,Alpha\n"
+        "2,24/11/2023,7,No,Beta\n"
+        "3,2024-01-05T10:00:00,x,true,Gamma\n"
+        "4,Jan 7 2024,1e3,maybe,Delta\n"
+        "5,05.01.2024,,false,Epsilon\n"
+        "6,bad,2.5,,Zeta\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+MIXED_TEMPLATE = {
+    "id": spec("id", "int"),
+    "day": spec("day", "date"),
+    "amount": spec("amount", "float"),
+    "flag": spec("flag", "bool"),
+    "name": spec("name", "str"),
+}
+
+
+def test_arrow_and_python_engines_agree(mixed_csv):
+    pytest.importorskip("pyarrow")
+    py_df, py_bad = validate_df_from_file(mixed_csv, MIXED_TEMPLATE)
+    ar_df, ar_bad = validate_df_from_file(mixed_csv, MIXED_TEMPLATE, engine="arrow")
+
+    assert list(py_bad["_reasons"]) == list(ar_bad["_reasons"]) == [
+        "amount: not float",
+        "flag: not bool",
+        "day: not date",
+    ]
+    assert list(ar_bad["_row"]) == [3, 4, 6]
+    for col in py_df.columns:
+        assert as_values(py_df[col]) == as_values(ar_df[col]), col
+    assert as_values(ar_df["day"])[:2] == [pd.Timestamp("2024-05-01"), pd.Timestamp("2023-11-24")]
+
+
+def test_large_int_parity(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "ids.csv"
+    path.write_text(
+        "id,name\n"
+        "9007199254740993,a\n"
+        "-9223372036854775807,b\n"
+        "+0005,c\n"
+        "1e3,d\n"
+        "2.5,e\n"
+        ",f\n"
+        "9223372036854775808,g\n",
+        encoding="utf-8",
+    )
+    template = {"id": spec("id", "int"), "name": spec("name", "str")}
+    py_df, py_bad = validate_df_from_file(path, template, keep_rejected=True)
+    ar_df, ar_bad = validate_df_from_file(path, template, keep_rejected=True, engine="arrow")
+
+    expected = [9007199254740993, -9223372036854775807, 5, 1000, None, None, None]
+    assert as_values(py_df["id"]) == as_values(ar_df["id"]) == expected
+    assert list(py_bad["_row"]) == list(ar_bad["_row"]) == [5, 7]
+
+
+def test_arrow_engine_on_sales_matches_python():
+    pytest.importorskip("pyarrow")
+    py_df = create_df_from_file(DATA / "sales.csv", SALES_TEMPLATE)
+    ar_df = create_df_from_file(DATA / "sales.csv", SALES_TEMPLATE, engine="arrow")
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in ar_df.dtypes)
+    for col in py_df.columns:
+        assert as_values(py_df[col]) == as_values(ar_df[col]), col
+
+
+def test_arrow_json_keeps_keys_missing_in_first_record(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "late_keys.json"
+    path.write_text('[{"id": 1}, {"id": 2, "amount": 5.5}, {"id": 3, "amount": 7}]',
+                    encoding="utf-8")
+    template = {"id": spec("id", "int"), "amount": spec("amount", "float")}
+
+    py_df = create_df_from_file(path, template)
+    ar_df = create_df_from_file(path, template, engine="arrow")
+    assert as_values(py_df["amount"]) == as_values(ar_df["amount"]) == [None, 5.5, 7.0]
+
+
+# --- Rollups ---
+
+@pytest.fixture
+def store_sales() -> pd.DataFrame:
+    template = {
+        "Category": spec("category", "str"),
+        "Location": spec("location", "str"),
+        "Total Spent": spec("total_spent", "float"),
+        "Transaction Date": spec("date", "date"),
+    }
+    return create_df_from_file(DATA / "retail_store_sales.csv", template)
+
+
+def sorted_rollup(rollup: pd.DataFrame) -> pd.DataFrame:
+    return rollup.sort_values(["day", "category", "location"], ignore_index=True)
+
+
+def test_incremental_rollup_matches_full_rollup(tmp_path, store_sales):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "rollup.parquet"
+    half = len(store_sales) // 2
+    update_rollup(path, store_sales.iloc[:half], "date", "total_spent")
+    merged = update_rollup(path, store_sales.iloc[half:], "date", "total_spent")
+
+    full = build_rollup(store_sales, "date", "total_spent")
+    pd.testing.assert_frame_equal(sorted_rollup(merged), sorted_rollup(full), check_dtype=False)
+    stored = pd.read_parquet(path)
+    assert stored["count"].sum() == store_sales["total_spent"].notna().sum()
+
+
+def test_query_rollup_matches_source(store_sales):
+    rollup = build_rollup(store_sales, "date", "total_spent")
+    result = query_rollup(rollup, "2023-01-01", "2023-12-31", by=("category",))
+
+    in_range = store_sales[(store_sales["date"] >= "2023-01-01") & (store_sales["date"] <= "2023-12-31")]
+    expected = in_range.groupby("category")["total_spent"].agg(["sum", "count", "min", "max"])
+    result = result.set_index("category")
+    assert result["sum"].to_dict() == pytest.approx(expected["sum"].to_dict())
+    assert result["count"].to_dict() == expected["count"].to_dict()
+    assert result["max"].to_dict() == expected["max"].to_dict()
+
+    total = query_rollup(rollup)
+    assert total["sum"].iloc[0] == pytest.approx(store_sales["total_spent"].sum())
+    with pytest.raises(ValueError, match="Unknown rollup dimensions"):
+        query_rollup(rollup, by=("nope",))
+
+
+def test_same_batch_is_ingested_once(tmp_path, store_sales):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "rollup.parquet"
+    batch = batch_id([DATA / "retail_store_sales.csv"])
+    first = update_rollup(path, store_sales, "date", "total_spent", batch=batch)
+    again = update_rollup(path, store_sales, "date", "total_spent", batch=batch)
+    assert again["count"].sum() == first["count"].sum()
+
+
+def test_missing_rollup_columns_fail_before_output(tmp_path):
+    pytest.importorskip("pyarrow")
+    from databridge import main
+
+    template = tmp_path / "sales_meta.json"
+    template.write_text(json.dumps(SALES_TEMPLATE), encoding="utf-8")
+    output = tmp_path / "out.csv"
+    code = main(["run", str(DATA / "sales.csv"), "-t", str(template), "-o", str(output),
+                 "--rollup", str(tmp_path / "r.parquet"), "--rollup-date", "nope"])
+    assert code == 1
+    assert not output.exists()
+
+
+def test_batch_ids_are_stored_with_the_rollup(tmp_path, store_sales, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "rollup.parquet"
+    half = len(store_sales) // 2
+    first = update_rollup(path, store_sales.iloc[:half], "date", "total_spent", batch="a")
+
+    # crash while replacing the file: the stored rollup and its ids stay unchanged
+    def crash(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr("etl.os.replace", crash)
+    with pytest.raises(OSError):
+        update_rollup(path, store_sales.iloc[half:], "date", "total_spent", batch="b")
+    monkeypatch.undo()
+    stored = pd.read_parquet(path)
+    assert stored.attrs["batches"] == ["a"]
+    assert stored["count"].sum() == first["count"].sum()
+
+    # retry after the crash is counted once
+    update_rollup(path, store_sales.iloc[half:], "date", "total_spent", batch="b")
+    update_rollup(path, store_sales.iloc[half:], "date", "total_spent", batch="b")
+    stored = pd.read_parquet(path)
+    assert stored.attrs["batches"] == ["a", "b"]
+    assert stored["count"].sum() == store_sales["total_spent"].notna().sum()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["rollup.parquet"]
+
+
+def test_rollup_dimension_mismatch_fails_before_output(tmp_path, dirty_csv):
+    pytest.importorskip("pyarrow")
+    from databridge import main
+
+    template = tmp_path / "meta.json"
+    template.write_text(json.dumps(SALES_TEMPLATE), encoding="utf-8")
+    rollup = tmp_path / "r.parquet"
+    base = ["run", str(dirty_csv), "-t", str(template), "--rollup", str(rollup)]
+    assert main(base + ["-o", str(tmp_path / "first.csv"), "--rollup-by", "category"]) == 0
+
+    output, quarantine = tmp_path / "out.csv", tmp_path / "bad.csv"
+    assert main(base + ["-o", str(output), "-q", str(quarantine),
+                        "--rollup-by", "category,quantity"]) == 1
+    assert not output.exists()
+    assert not quarantine.exists()
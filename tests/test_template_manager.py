@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import json
+
+import pandas as pd
+import pytest
+
+from databridge import main
+from template_manager import (MetaEditor, infer_template, infer_type, load_sample,
+                              profile_column, save_inferred_template)
+
+
+@pytest.fixture
+def feed_csv(tmp_path: Path) -> Path:
+    rows = ["id,flag,bit,qty,price,day,name,note"]
+    days = ["2024-02-01", "05/01/2024", "Jan 7 2024", "2024-01-05T10:00:00"]
+    for i in range(1, 21):
+        rows.append(",".join([
+            str(i),
+            "yes" if i % 2 else "No",
+            str(i % 2),
+            str(i % 3 + 1),
+            f"{i}.50" if i % 4 else str(i),
+            days[i % 4],
+            "Beauty" if i % 2 else "Clothing",
+            "n/a" if i % 5 else "ok",
+        ]))
+    path = tmp_path / "feed.csv"
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return path
+
+
+def test_profile_counts_null_markers(feed_csv):
+    profile = profile_column(load_sample(feed_csv)["note"])
+    assert profile["null_ratio"] == 0.8
+    assert profile["cardinality"] == 1
+    assert not profile["key"]
+
+
+def test_profile_mixed_date_formats():
+    values = pd.Series(["05/01/2024"] + ["2024-02-01"] * 97 + ["Jan 7 2024", "2024-01-05T10:00:00"])
+    profile = profile_column(values)
+    assert profile["date_rate"] == 1.0
+    assert infer_type(profile) == "date"
+
+
+def test_infer_types(feed_csv):
+    template = infer_template(load_sample(feed_csv))
+    types = {h: m["type"] for h, m in template.items()}
+    assert types == {
+        "id": "int",        # integral key
+        "flag": "bool",
+        "bit": "float",     # 1/0 is numeric, not a flag; non-key -> float
+        "qty": "float",     # integral but not a key
+        "price": "float",
+        "day": "date",
+        "name": "str",
+        "note": "str",
+    }
+    assert template["id"]["profile"]["key"]
+    assert not template["qty"]["profile"]["key"]
+    assert all(m["save"] for m in template.values())
+
+
+def test_sample_is_file_head(feed_csv):
+    assert len(load_sample(feed_csv, sample_size=5)) == 5
+
+
+def test_save_inferred_template(feed_csv):
+    out = save_inferred_template(feed_csv)
+    assert out == feed_csv.parent / "templates" / "feed_meta.json"
+    saved = json.loads(out.read_text(encoding="utf-8"))
+    assert saved["day"]["type"] == "date"
+    assert saved["id"]["target_name"] == "id"
+    assert set(saved["price"]) >= {"target_name", "type", "format", "header_case", "save", "profile"}
+
+
+def test_metaeditor_infer_meta(feed_csv):
+    editor = MetaEditor(feed_csv)
+    assert editor.meta["flag"]["type"] == "str"
+    editor.infer_meta()
+    assert editor.meta["flag"]["type"] == "bool"
+    assert editor.meta["day"]["type"] == "date"
+
+
+def test_databridge_infer(feed_csv, tmp_path, capsys):
+    out = tmp_path / "custom_meta.json"
+    assert main(["infer", str(feed_csv), "-o", str(out), "--sample-size", "10"]) == 0
+    saved = json.loads(out.read_text(encoding="utf-8"))
+    assert saved["name"]["type"] == "str"
+    assert "Template saved" in capsys.readouterr().err
+    assert main(["infer", str(tmp_path / "missing.csv")]) == 1